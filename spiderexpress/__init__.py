@@ -1,8 +1,25 @@
 """.. include:: ../README.md"""
 
-from .spider import Spider
-from .types import Configuration, PlugIn
+import importlib
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .spider import Spider
+    from .types import Configuration, PlugIn
 
 __all__ = ["Spider", "Configuration", "PlugIn"]
 
 __version__ = "0.2.0a0"
+
+_LAZY_ATTRIBUTES = {
+    "Spider": ".spider",
+    "Configuration": ".types",
+    "PlugIn": ".types",
+}
+
+
+def __getattr__(name: str):
+    """Import the public classes on first access, not on import of the package."""
+    if name in _LAZY_ATTRIBUTES:
+        return getattr(importlib.import_module(_LAZY_ATTRIBUTES[name], __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -12,6 +12,7 @@ Todo
 - find a mechanism for stopping/starting collections
 """
 
+import dataclasses
 import sys
 from importlib.metadata import entry_points
 from pathlib import Path
@@ -20,16 +21,15 @@ import click
 import yaml
 from loguru import logger as log
 
-from .spider import CONNECTOR_GROUP, STRATEGY_GROUP, Spider
-from .types import Configuration
+# The spider and its dependencies (pandas, SQLAlchemy, ...) are imported by the
+# commands which need them, keeping `--help` and shell completion snappy.
+# pylint: disable=C0415
 
 
 @click.group()
-@click.pass_context
 @log.catch
-def cli(ctx):
+def cli():
     """Traverse the deserts of the internet."""
-    ctx.ensure_object(Spider)
 
 
 @cli.command()
@@ -41,6 +41,9 @@ def cli(ctx):
 @click.pass_context
 def start(ctx: click.Context, config: Path, verbose: int, logfile: str):
     """start a job"""
+    from .spider import Spider
+
+    ctx.ensure_object(Spider)
     logging_level = max(
         50 - (10 * verbose), 0
     )  # Allows logging level to be between 0 and 50.
@@ -58,6 +61,8 @@ def start(ctx: click.Context, config: Path, verbose: int, logfile: str):
 @click.option("--interactive/--non-interactive", default=False)
 def create(config: str, interactive: bool):
     """create a new configuration"""
+    from .types import YAML_DUMPER, Configuration
+
     args = {"seeds": None, "seed_file": None}
 
     if interactive:
@@ -76,12 +81,14 @@ def create(config: str, interactive: bool):
     conf = Configuration(**args)
 
     with (Path() / f"{config}.pe.yml").open("w", encoding="utf8") as file:
-        yaml.dump(conf, file)
+        yaml.dump(dataclasses.asdict(conf), file, Dumper=YAML_DUMPER)
 
 
 @cli.command()
 def list():  # pylint: disable=W0622
     """list all plugins"""
+    from .plugin_manager import CONNECTOR_GROUP, STRATEGY_GROUP
+
     click.echo("--- connectors ---")
     for connector in entry_points(group=CONNECTOR_GROUP):
         click.echo(connector.name)
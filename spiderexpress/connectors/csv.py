@@ -3,6 +3,7 @@
 import dataclasses
 from typing import Dict, List, Optional, Tuple, Union
 
+import numpy as np
 import pandas as pd
 
 from spiderexpress.types import PlugIn, from_dict
@@ -10,7 +11,7 @@ from spiderexpress.types import PlugIn, from_dict
 _cache = {}
 
 
-@dataclasses.dataclass
+@dataclasses.dataclass(slots=True, frozen=True)
 class CSVConnectorConfiguration:
     """Configuration items for the csv_connector."""
 
@@ -20,6 +21,51 @@ class CSVConnectorConfiguration:
     cache: bool = True
 
 
+def _read_edge_list(location: str, categorical: bool = False) -> pd.DataFrame:
+    """Read an edge list.
+
+    With ``categorical``, ``source`` and ``target`` share one categorical dtype. That
+    only pays off for cached frames, which are filtered over and over again.
+    """
+    edges = pd.read_csv(location, dtype=str)
+    if not categorical:
+        return edges
+    node_ids = pd.CategoricalDtype(
+        pd.Index(np.concatenate([edges["source"], edges["target"]])).dropna().unique()
+    )
+    return edges.astype({"source": node_ids, "target": node_ids})
+
+
+def _read_node_list(location: str, categorical: bool = False) -> pd.DataFrame:
+    """Read a node list, with ``categorical`` its ``name`` column is categorical."""
+    nodes = pd.read_csv(location, dtype=str)
+    return nodes.astype({"name": "category"}) if categorical else nodes
+
+
+def _isin(column: pd.Series, ids: pd.Index) -> np.ndarray:
+    """Boolean mask of the values in ``column`` which are contained in ``ids``."""
+    if isinstance(column.dtype, pd.CategoricalDtype):
+        # Compare integer codes instead of hashing every string in the column
+        codes = column.cat.categories.get_indexer(ids)
+        return np.isin(column.cat.codes.to_numpy(), codes[codes >= 0])
+    return ids.get_indexer(column.to_numpy()) >= 0
+
+
+def _isin_either(first: pd.Series, second: pd.Series, ids: pd.Index) -> np.ndarray:
+    """Boolean mask of the rows in which ``first`` or ``second`` is in ``ids``.
+
+    If both columns share their categories, as ``source`` and ``target`` do, the ids
+    are looked up in the categories only once.
+    """
+    if isinstance(first.dtype, pd.CategoricalDtype) and first.dtype == second.dtype:
+        codes = first.cat.categories.get_indexer(ids)
+        codes = codes[codes >= 0]
+        return np.isin(first.cat.codes.to_numpy(), codes) | np.isin(
+            second.cat.codes.to_numpy(), codes
+        )
+    return _isin(first, ids) | _isin(second, ids)
+
+
 def csv_connector(
     node_ids: List[str], configuration: Union[Dict, CSVConnectorConfiguration]
 ) -> Tuple[pd.DataFrame, pd.DataFrame]:
@@ -29,32 +75,36 @@ def csv_connector(
 
     if configuration.cache:
         if configuration.edge_list_location not in _cache:
-            _cache[configuration.edge_list_location] = pd.read_csv(
-                configuration.edge_list_location, dtype=str
+            _cache[configuration.edge_list_location] = _read_edge_list(
+                configuration.edge_list_location, categorical=True
             )
-        edges = _cache[configuration.edge_list_location].copy()
+        # The cached frames are only ever filtered below, never mutated in place,
+        # hence they are handed out without copying.
+        edges = _cache[configuration.edge_list_location]
         if configuration.node_list_location:
             if configuration.node_list_location not in _cache:
-                _cache[configuration.node_list_location] = pd.read_csv(
-                    configuration.node_list_location, dtype=str
+                _cache[configuration.node_list_location] = _read_node_list(
+                    configuration.node_list_location, categorical=True
                 )
-            nodes = _cache[configuration.node_list_location].copy()
+            nodes = _cache[configuration.node_list_location]
         else:
             nodes = None
     else:
-        edges = pd.read_csv(configuration.edge_list_location, dtype=str)
+        edges = _read_edge_list(configuration.edge_list_location)
         nodes = (
-            pd.read_csv(configuration.node_list_location, dtype=str)
+            _read_node_list(configuration.node_list_location)
             if configuration.node_list_location
             else None
         )
 
+    ids = pd.Index(node_ids).unique()
+
     if configuration.mode == "in":
-        mask = edges["target"].isin(node_ids)
+        mask = _isin(edges["target"], ids)
     elif configuration.mode == "out":
-        mask = edges["source"].isin(node_ids)
+        mask = _isin(edges["source"], ids)
     elif configuration.mode == "both":
-        mask = edges["target"].isin(node_ids) | edges["source"].isin(node_ids)
+        mask = _isin_either(edges["target"], edges["source"], ids)
     else:
         raise ValueError(f"{configuration.mode} is not one of 'in', 'out' or 'both'.")
 
@@ -64,7 +114,7 @@ def csv_connector(
     return (
         edge_return,
         (
-            nodes.loc[nodes.name.isin(node_ids), :]
+            nodes.loc[_isin(nodes["name"], ids), :]
             if nodes is not None
             else pd.DataFrame()
         ),
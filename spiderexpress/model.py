@@ -4,16 +4,21 @@ It keeps track of the crawled data, the configuration and the current state of t
 """
 
 import datetime
-from typing import Callable, Dict, List
+import functools
+from typing import Any, Callable, Dict, List, Tuple, Type
 
 import sqlalchemy as sql
 from loguru import logger as log
 from sqlalchemy import JSON, orm
+from sqlalchemy.dialects import postgresql, sqlite
 
 # pylint: disable=R0903, W0622
 
 _DATABASE_BUSY_ = False
 
+_IN_CLAUSE_SIZE_ = 900
+"""Values bound per IN clause, stays below SQLite's default limit of 999 variables."""
+
 mapper_registry = orm.registry()
 type_lookup = {
     "Integer": sql.Integer,
@@ -28,12 +33,21 @@ class Base(orm.DeclarativeBase):
     type_annotation_map = {Dict: JSON}
 
     def __repr__(self):
-        props = [
-            f"{key}={value}"
-            for key, value in self.__dict__.items()
-            if not key.startswith("_")
-        ]
-        return f"<{self.__class__.__name__} {' '.join(props)} />"
+        # Read from __dict__ so that unloaded attributes do not trigger a query,
+        # they are left out instead
+        state = self.__dict__
+        props = " ".join(
+            f"{name}={state[name]}"
+            for name in _column_names(type(self))
+            if name in state
+        )
+        return f"<{self.__class__.__name__} {props} />"
+
+
+@functools.lru_cache(maxsize=None)
+def _column_names(cls: Type[Base]) -> Tuple[str, ...]:
+    """Column attribute names of a model class, in declaration order."""
+    return tuple(cls.__mapper__.column_attrs.keys())
 
 
 class AppMetaData(Base):
@@ -50,6 +64,9 @@ class SeedList(Base):
     """Table of seed nodes for each iteration."""
 
     __tablename__ = "seed_list"
+    __table_args__ = (
+        sql.Index("ix_seed_list_iteration_status", "iteration", "status"),
+    )
 
     id: orm.Mapped[str] = orm.mapped_column(primary_key=True, index=True)
     status: orm.Mapped[str] = orm.mapped_column()
@@ -62,6 +79,7 @@ class TaskList(Base):
     """Table of tasks for each iteration."""
 
     __tablename__ = "task_list"
+    __table_args__ = (sql.Index("ix_task_list_status_id", "status", "id"),)
 
     id: orm.Mapped[int] = orm.mapped_column(primary_key=True, autoincrement=True)
     node_id: orm.Mapped[str] = orm.mapped_column()
@@ -99,6 +117,11 @@ class LayerDenseEdges(Base):
     """Table for dense data storage."""
 
     __tablename__ = "layer_dense_edges"
+    __table_args__ = (
+        sql.Index(
+            "ix_layer_dense_edges_layer_source_target", "layer_id", "source", "target"
+        ),
+    )
 
     id: orm.Mapped[str] = orm.mapped_column(primary_key=True, index=True)
     source: orm.Mapped[str] = orm.mapped_column(index=True)
@@ -117,7 +140,7 @@ class LayerDenseNodes(Base):
     __tablename__ = "layer_dense_nodes"
 
     id: orm.Mapped[str] = orm.mapped_column(primary_key=True, index=True)
-    name: orm.Mapped[str] = orm.mapped_column()
+    name: orm.Mapped[str] = orm.mapped_column(index=True)
     layer_id: orm.Mapped[str] = orm.mapped_column(index=True)
     node_type: orm.Mapped[str] = orm.mapped_column(index=True)
     created_at: orm.Mapped[datetime.datetime] = orm.mapped_column(
@@ -173,16 +196,51 @@ class SamplerStateStore(Base):
 
 
 def _merge_list_of_dicts(
-    session: orm.Session, data: List[Dict], factory: Callable[[Dict], Base]
+    session: orm.Session,
+    model: Type[Base],
+    data: List[Any],
+    factory: Callable[[Any], Dict[str, Any]],
 ) -> None:
-    """Merge a list of dictionaries into the database."""
+    """Merge a list of dictionaries into the database.
+
+    The factory maps each item to a row of ``model``'s table. Rows are written with a
+    single bulk upsert on the primary key, plain inserts if the key is generated by the
+    database. Dialects without upsert support fall back to ``Session.merge``.
+    """
     global _DATABASE_BUSY_  # pylint: disable=W0603
     if _DATABASE_BUSY_ is True:
         log.warning("Database is busy, skipping insert.")
     _DATABASE_BUSY_ = True
 
-    for item in data:
-        session.merge(factory(item))
+    rows = [factory(item) for item in data]
+    table = model.__table__
+    primary_key = [column.name for column in table.primary_key]
+    dialect = session.get_bind().dialect.name
+
+    if len(rows) == 0:
+        pass
+    elif not all(key in rows[0] for key in primary_key):
+        session.execute(sql.insert(table), rows)
+    elif dialect in ("sqlite", "postgresql"):
+        # The last row for a key wins, as it would with consecutive merges
+        rows = list(
+            {tuple(row[key] for key in primary_key): row for row in rows}.values()
+        )
+        insert = (sqlite if dialect == "sqlite" else postgresql).insert(table)
+        session.execute(
+            insert.on_conflict_do_update(
+                index_elements=primary_key,
+                set_={
+                    key: insert.excluded[key]
+                    for key in rows[0]
+                    if key not in primary_key
+                },
+            ),
+            rows,
+        )
+    else:
+        for row in rows:
+            session.merge(model(**row))
 
     _DATABASE_BUSY_ = False
 
@@ -192,7 +250,7 @@ def insert_layer_dense_edge(session: orm.Session, edge_type: str, data: List[Dic
     layer_counts = {}
 
     def _factory_(item):
-        log.debug(f"Inserting dense edge for {item}")
+        log.debug("Inserting dense edge for {}", item)
         source = item.get("source")
         target = item.get("target")
         layer_id = item.get("dispatch_with")
@@ -202,16 +260,16 @@ def insert_layer_dense_edge(session: orm.Session, edge_type: str, data: List[Dic
             layer_counts[layer_id] += 1
         id = f"{layer_id}:{source}-{target}"
 
-        return LayerDenseEdges(
-            id=id,
-            source=source,
-            target=target,
-            edge_type=edge_type,
-            layer_id=layer_id,
-            data=item,
-        )
+        return {
+            "id": id,
+            "source": source,
+            "target": target,
+            "edge_type": edge_type,
+            "layer_id": layer_id,
+            "data": item,
+        }
 
-    _merge_list_of_dicts(session, data, _factory_)
+    _merge_list_of_dicts(session, LayerDenseEdges, data, _factory_)
 
     _layer_count_str_ = ", ".join(
         (f"{layer}: {count}" for layer, count in layer_counts.items())
@@ -227,11 +285,15 @@ def insert_layer_dense_node(
     def _factory_(item):
         name = item.get("name")
         id = f"{layer_id}:{name}"
-        return LayerDenseNodes(
-            id=id, name=name, layer_id=layer_id, node_type=node_type, data=item
-        )
+        return {
+            "id": id,
+            "name": name,
+            "layer_id": layer_id,
+            "node_type": node_type,
+            "data": item,
+        }
 
-    _merge_list_of_dicts(session, data, _factory_)
+    _merge_list_of_dicts(session, LayerDenseNodes, data, _factory_)
 
     log.info(f"Inserted {len(data)} dense node in layer {layer_id}")
 
@@ -245,11 +307,15 @@ def insert_layer_sparse_node(
         name = item.get("name")
         id = f"{layer_id}:{name}"
 
-        return LayerSparseNodes(
-            id=id, name=name, layer_id=layer_id, node_type=node_type, data=item
-        )
+        return {
+            "id": id,
+            "name": name,
+            "layer_id": layer_id,
+            "node_type": node_type,
+            "data": item,
+        }
 
-    _merge_list_of_dicts(session, data, _factory_sparse_node_)
+    _merge_list_of_dicts(session, LayerSparseNodes, data, _factory_sparse_node_)
     log.info(f"Inserted {len(data)} sparse nodes in layer {layer_id}.")
 
 
@@ -263,27 +329,53 @@ def insert_layer_sparse_edge(
         target = item.get("target")
         weight = item.get("weight")
         id = f"{layer_id}:{source}-{target}"
-        return LayerSparseEdges(
-            id=id,
-            source=source,
-            target=target,
-            weight=weight,
-            edge_type=edge_type,
-            layer_id=layer_id,
-            data=item,
-        )
-
-    _merge_list_of_dicts(session, data, _factory_sparse_edge_)
+        return {
+            "id": id,
+            "source": source,
+            "target": target,
+            "weight": weight,
+            "edge_type": edge_type,
+            "layer_id": layer_id,
+            "data": item,
+        }
+
+    _merge_list_of_dicts(session, LayerSparseEdges, data, _factory_sparse_edge_)
 
     log.info(f"Inserted {len(data)} sparse edges in layer {layer_id}.")
 
 
-def insert_sampler_state(session, layer_id, iteration, data):
-    """Insert the state of the sampler into the database."""
-    sampler_state = SamplerStateStore(iteration=iteration, layer_id=layer_id, data=data)
-    session.add(sampler_state)
+def insert_sampler_state(
+    session: orm.Session, layer_id: str, iteration: int, data: List[Dict]
+):
+    """Insert the state of the sampler into the database, one row per record."""
+
+    def _sampler_state_factory_(state):
+        return {"iteration": iteration, "layer_id": layer_id, "data": state}
+
+    _merge_list_of_dicts(session, SamplerStateStore, data, _sampler_state_factory_)
+
+    log.debug(
+        "Inserted sampler state for layer {} at iteration {}", layer_id, iteration
+    )
+
+
+def _select_in_(
+    session: orm.Session, column: orm.InstrumentedAttribute, values: List, *criteria
+) -> set:
+    """Select which of ``values`` are present in ``column``.
 
-    log.debug(f"Inserted sampler state for layer {layer_id} at iteration {iteration}")
+    The values are bound in chunks of ``_IN_CLAUSE_SIZE_``, so that large lists stay
+    within the database's limit of bound parameters, usually in a single query.
+    """
+    found = set()
+    for start in range(0, len(values), _IN_CLAUSE_SIZE_):
+        chunk = values[start : start + _IN_CLAUSE_SIZE_]
+        found.update(
+            session.execute(
+                sql.select(column).where(column.in_(chunk), *criteria)
+            ).scalars()
+        )
+    return found
 
 
 def insert_seeds(
@@ -296,10 +388,13 @@ def insert_seeds(
     """Insert seeds into the database."""
 
     def _seed_factory_(seed):
-        return SeedList(id=seed, status=status, layer=layer, iteration=iteration)
+        return {"id": seed, "status": status, "layer": layer, "iteration": iteration}
 
-    _seeds_ = list(filter(lambda x: session.get(SeedList, x) is None, seeds))
-    _merge_list_of_dicts(session, _seeds_, _seed_factory_)
+    # Deduplicate first, otherwise a repeated seed would be dispatched twice
+    _seeds_ = list(dict.fromkeys(seeds))
+    known = _select_in_(session, SeedList.id, _seeds_)
+    _seeds_ = [seed for seed in _seeds_ if seed not in known]
+    _merge_list_of_dicts(session, SeedList, _seeds_, _seed_factory_)
     insert_task(session, _seeds_, layer, parent_task=None)
 
     log.info(f"Inserted {len(seeds)} seeds.")
@@ -311,14 +406,17 @@ def insert_task(
     """Insert a task into the database."""
 
     def _task_factory_(node_id):
-        return TaskList(
-            node_id=node_id,
-            status="new",
-            connector=connector,
-            parent_task_id=parent_task.id if parent_task is not None else None,
-        )
-
-    _merge_list_of_dicts(session, node_ids, _task_factory_)
+        return {
+            "node_id": node_id,
+            "status": "new",
+            "connector": connector,
+            "parent_task_id": parent_task.id if parent_task is not None else None,
+        }
+
+    # No lookup of pending tasks: insert_seeds only passes ids missing from the seed
+    # list, and every task is created along with its seed.
+    node_ids = list(dict.fromkeys(node_ids))
+    _merge_list_of_dicts(session, TaskList, node_ids, _task_factory_)
 
     log.info(f"Inserted {len(node_ids)} tasks.")
 
@@ -343,19 +441,32 @@ def insert_raw_data(
             _counter_[id_stub] += 1
         id = f"{id_stub}:{_counter_[id_stub]}"
 
-        return RawDataStore(
-            id=id,
-            connector_id=connector_id,
-            output_type=output_type,
-            data=item,
-            iteration=iteration,
-        )
+        return {
+            "id": id,
+            "connector_id": connector_id,
+            "output_type": output_type,
+            "data": item,
+            "iteration": iteration,
+        }
 
-    _merge_list_of_dicts(session, data, _raw_data_factory_)
+    _merge_list_of_dicts(session, RawDataStore, data, _raw_data_factory_)
 
     log.info(f"Inserted raw data for connector {connector_id} of type {output_type}.")
 
 
 def get_open_tasks(session: orm.Session, limit: int = 10):
-    """Get open tasks from the database."""
-    return session.query(TaskList).filter(TaskList.status == "new").limit(limit).all()
+    """Get open tasks from the database, oldest first."""
+    return (
+        session.query(TaskList)
+        .filter(TaskList.status == "new")
+        .order_by(TaskList.id)
+        .limit(limit)
+        .all()
+    )
+
+
+def has_open_tasks(session: orm.Session) -> bool:
+    """Check whether any task is still open, without loading it."""
+    return session.execute(
+        sql.select(sql.exists().where(TaskList.status == "new"))
+    ).scalar()
@@ -2,32 +2,41 @@
 
 import functools
 import importlib.metadata as mt
-import sys
-from typing import Callable, Optional
+from typing import Callable, Dict, Optional
 
 from loguru import logger as log
 
 from spiderexpress.types import PlugIn, PlugInSpec
 
+CONNECTOR_GROUP = "spiderexpress.connectors"
+"""Entry point group of the connectors."""
 
+STRATEGY_GROUP = "spiderexpress.strategies"
+"""Entry point group of the strategies."""
+
+
+@functools.lru_cache(maxsize=None)
+def _entry_points(group: str) -> Dict[str, mt.EntryPoint]:
+    # Scanning the installed distributions' metadata is expensive, do it once per group
+    return {
+        entry_point.name: entry_point for entry_point in mt.entry_points(group=group)
+    }
+
+
+@functools.lru_cache(maxsize=None)
 def _access_entry_point(name: str, group: str) -> Optional[PlugIn]:
-    candidates = (
-        mt.entry_points().select(name=name, group=group)
-        if sys.version_info.minor >= 10
-        else [_ for _ in mt.entry_points()[group] if _.name == name]
-    )
+    entry_point = _entry_points(group).get(name)
 
-    log.info(f"Accessed this. { candidates }.")
+    log.debug("Accessed this. {}.", entry_point)
 
-    if len(candidates) == 1:
-        plugin: PlugIn = candidates[name].load()
+    if entry_point is not None:
+        plugin: PlugIn = entry_point.load()
 
-        log.debug(f"Got { plugin }")
+        log.debug("Got {}", plugin)
         return plugin
     return None
 
 
-@functools.singledispatch
 def get_plugin(spec: PlugInSpec, group: str) -> Callable:
     """Get a plug-in.
 
@@ -38,32 +47,28 @@ def get_plugin(spec: PlugInSpec, group: str) -> Callable:
         The function associated with the spec
     Raises:
         ValueError: if the spec's name is not found
+        TypeError: if the spec is neither a name nor a dictionary
     """
-    raise NotImplementedError("This function was intentionally not implemented.")
-
-
-@get_plugin.register(str)
-def _(spec: str, group: str) -> Callable:
-    plugin = _access_entry_point(spec, group)
-    if not plugin:
-        raise ValueError(f"{spec} could not be found in {group}")
-    return functools.partial(
-        plugin.callable, configuration=plugin.default_configuration
-    )
-
-
-@get_plugin.register(dict)
-def _(spec: dict, group: str) -> Callable:
-    if len(spec.keys()) > 1:
-        log.warning(
-            f"Requested specification {spec} has more than one type. "
-            "Using the first instance found"
-        )
-    for name, configuration in spec.items():
-        plugin = _access_entry_point(name, group)
+    if isinstance(spec, str):
+        plugin = _access_entry_point(spec, group)
         if not plugin:
             raise ValueError(f"{spec} could not be found in {group}")
-        return functools.partial(plugin.callable, configuration=configuration)
+        return functools.partial(
+            plugin.callable, configuration=plugin.default_configuration
+        )
+    if isinstance(spec, dict):
+        if len(spec.keys()) > 1:
+            log.warning(
+                f"Requested specification {spec} has more than one type. "
+                "Using the first instance found"
+            )
+        for name, configuration in spec.items():
+            plugin = _access_entry_point(name, group)
+            if not plugin:
+                raise ValueError(f"{spec} could not be found in {group}")
+            return functools.partial(plugin.callable, configuration=configuration)
+        raise ValueError(f"{spec} does not name a plug-in in {group}")
+    raise TypeError(f"Plug-in specifications of {type(spec)} are unknown.")
 
 
 def get_default_configuration(name: str, group: str):  # pylint: disable=W0613
@@ -61,6 +61,16 @@ class Router:
         # Validate the spec against the rule set
         Router.validate_spec(name, spec, context)
         self.spec: RouterSpec = spec
+        # Compile each target's pattern once instead of on every parsed record
+        try:
+            self._patterns_: List[Optional[re.Pattern]] = [
+                re.compile(directive["pattern"]) if "pattern" in directive else None
+                for directive in spec.get(Router.TARGET)
+            ]
+        except re.error as error:
+            raise RouterValidationError(
+                f"{name}: invalid pattern in {spec.get(Router.TARGET)}: {error}"
+            ) from error
 
     @classmethod
     def validate_spec(cls, name, spec, context):
@@ -109,14 +119,16 @@ class Router:
         ret = []
         constant = {}
 
-        log.debug(f"Router '{self.name}' parsing {input_data}")
+        log.debug("Router '{}' parsing {}", self.name, input_data)
 
         # First we calculate all constants
         for edge_key, spec in self.spec.items():
             if isinstance(spec, str):
                 constant[edge_key] = input_data.get(spec)
         if isinstance(self.spec.get(Router.TARGET), list):
-            for directive in self.spec.get(Router.TARGET, []):
+            for directive, pattern in zip(
+                self.spec.get(Router.TARGET, []), self._patterns_
+            ):
                 value = input_data.get(directive.get("field"))
                 # Add further constants if there are some defined in the spec
                 local_constant = {
@@ -127,12 +139,12 @@ class Router:
                     },
                     **constant,
                 }
-                if "pattern" not in directive:
+                if pattern is None:
                     # Simply get the value and return a
                     ret.append({Router.TARGET: value, **local_constant})
                     continue
                 # Get all matches from the string and return an edge for each
-                matches = re.findall(directive.get("pattern"), value)
+                matches = pattern.findall(value)
                 for match in matches:
                     ret.append({Router.TARGET: match, **local_constant})
             return ret
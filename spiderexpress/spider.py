@@ -2,19 +2,28 @@
 
 Constants:
 
-CONNECTOR_GROUP :
-    str : group name of our connector entrypoint
+CONNECTOR_GROUP, STRATEGY_GROUP :
+    str : group names of our connector and strategy entrypoints, re-exported from
+    spiderexpress.plugin_manager
 
-STRATEGY_GROUP :
-    str : group name of our strategy entrypoint
+GATHER_BATCH_SIZE :
+    int : number of tasks gathered in one step
+
+SQLITE_PRAGMAS :
+    Dict[str, Union[str, int]] : pragmas set on each connection to a SQLite database
+
+YAML_LOADER, YAML_DUMPER :
+    libyaml-backed (de-)serializers for configuration files, pure Python if unavailable,
+    re-exported from spiderexpress.types
 
 Todo:
 - nicer way to pass around the dynamic ORM classes
 """
 
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, Optional, Tuple, Union
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
 
 import pandas as pd
 import sqlalchemy as sql
@@ -32,7 +41,9 @@ from spiderexpress.model import (
     SamplerStateStore,
     SeedList,
     TaskList,
+    _select_in_,
     get_open_tasks,
+    has_open_tasks,
     insert_layer_dense_edge,
     insert_layer_dense_node,
     insert_layer_sparse_edge,
@@ -41,18 +52,45 @@ from spiderexpress.model import (
     insert_sampler_state,
     insert_seeds,
 )
-from spiderexpress.plugin_manager import get_plugin
+from spiderexpress.plugin_manager import CONNECTOR_GROUP, STRATEGY_GROUP, get_plugin
 from spiderexpress.router import Router
-from spiderexpress.types import Configuration, Connector, Strategy, from_dict
+from spiderexpress.types import (  # pylint: disable=W0611
+    YAML_DUMPER,
+    YAML_LOADER,
+    Configuration,
+    Connector,
+    PlugInSpec,
+    Strategy,
+    from_dict,
+)
 
 # pylint: disable=W0613,E1101,C0103,R0902,R0911
 
 
-CONNECTOR_GROUP = "spiderexpress.connectors"
-STRATEGY_GROUP = "spiderexpress.strategies"
-
 MAX_RETRIES = 3
 
+GATHER_BATCH_SIZE = 100
+"""Number of open tasks gathered in one step, with one connector call per layer."""
+
+SQLITE_PRAGMAS = {
+    "journal_mode": "WAL",
+    "synchronous": "NORMAL",
+    "cache_size": -65536,
+    "temp_store": "MEMORY",
+    "mmap_size": 268435456,
+}
+"""Pragmas for SQLite connections: write-ahead logging needs fewer fsyncs per commit,
+a 64 MiB page cache, in-memory temporary tables and 256 MiB of memory-mapped I/O
+keep repeated reads of the layer tables off the disk."""
+
+
+def _set_sqlite_pragmas(dbapi_connection, connection_record) -> None:
+    """Applies ``SQLITE_PRAGMAS`` to a freshly opened SQLite connection."""
+    cursor = dbapi_connection.cursor()
+    for pragma, value in SQLITE_PRAGMAS.items():
+        cursor.execute(f"PRAGMA {pragma}={value}")
+    cursor.close()
+
 
 class Spider:
     """This is spiderexpress' Spider.
@@ -195,14 +233,17 @@ class Spider:
         self.strategy: Optional[Strategy] = None
         self._cache_: Optional[orm.sessionmaker] = None
         self._engine_: Optional[sql.Engine] = None
+        self._routers_: Dict[Tuple[str, str], Router] = {}
+        self._iteration_: Optional[int] = None
+        self._plugins_: Dict[Tuple[str, str], Callable] = {}
         # self.appstate: Optional[AppMetaData] = None
 
     def is_gathering_done(self):
         """Checks if the gathering phase is done."""
         with self._cache_.begin() as session:
-            tasks = get_open_tasks(session)
-            log.debug(f"Checking if gathering is done. {len(tasks)} tasks left.")
-            return len(tasks) == 0
+            done = not has_open_tasks(session)
+            log.debug("Checking if gathering is done: {}.", done)
+            return done
 
     def is_gathering_not_done(self):
         """Checks if the gathering phase is not done."""
@@ -211,9 +252,10 @@ class Spider:
     def _conditional_advance(self, *args) -> None:
         """Advances the state machine when the current state is done."""
 
-        log.debug(
-            f"Current state: {self.state}, called with"
-            f"{', '.join([str(_) for _ in args]) or 'nothing'}."
+        log.opt(lazy=True).debug(
+            "Current state: {}, called with {}.",
+            lambda: self.state,
+            lambda: ", ".join([str(_) for _ in args]) or "nothing",
         )
 
         if self.state == "idle":
@@ -247,8 +289,10 @@ class Spider:
 
         targets = self.machine.get_triggers(self.state)
 
-        log.debug(
-            f"Advancing from {self.state} and I can trigger {', '.join(targets) or 'nothing'}."
+        log.opt(lazy=True).debug(
+            "Advancing from {} and I can trigger {}.",
+            lambda: self.state,
+            lambda: ", ".join(targets) or "nothing",
         )
 
         for target in targets:
@@ -268,8 +312,10 @@ class Spider:
                     f"Configuration file {config_file} does not exist."
                 )
 
-            with config_file.open("r", encoding="utf8") as file:
-                self.configuration = from_dict(Configuration, yaml.safe_load(file))
+            # libyaml parses one contiguous buffer instead of pulling chunks via .read()
+            self.configuration = from_dict(
+                Configuration, yaml.load(config_file.read_bytes(), Loader=YAML_LOADER)
+            )
 
     def is_config_valid(self):
         """Asserts that the configuration is valid."""
@@ -284,17 +330,21 @@ class Spider:
             raise ValueError("No configuration loaded.")
         if not self.configuration.db_url:
             raise ValueError("No database url set.")
-        if self.configuration.db_schema is not None:
-            sql.event.listen(
-                Base.metadata,
-                "before_create",
-                sql.DDL(f"CREATE SCHEMA IF NOT EXISTS {self.configuration.db_schema}"),
-            )
 
         self._engine_ = sql.create_engine(
             self.configuration.db_url,
         )
+        if self._engine_.dialect.name == "sqlite":
+            sql.event.listen(self._engine_, "connect", _set_sqlite_pragmas)
         if self.configuration.db_schema is not None:
+            # Created on this engine only, a listener on the shared metadata would be
+            # registered again with every spider that opens a database
+            with self._engine_.begin() as connection:
+                connection.execute(
+                    sql.schema.CreateSchema(
+                        self.configuration.db_schema, if_not_exists=True
+                    )
+                )
             self._engine_ = self._engine_.execution_options(
                 schema_translate_map={None: self.configuration.db_schema}
             )
@@ -303,14 +353,21 @@ class Spider:
             self._engine_,
             autobegin=False,
         )
+        self._iteration_ = None
 
         Base.metadata.create_all(self._engine_)
 
     @property
     def iteration(self) -> int:
-        """Returns the current iteration."""
+        """Returns the current iteration.
+
+        It is read from the database once and then kept in sync by
+        ``increment_iteration``, the only place where it changes.
+        """
         if not self._cache_:
             raise ValueError("Cache is not present.")
+        if self._iteration_ is not None:
+            return self._iteration_
 
         with self._cache_.begin() as session:
             appstate: Optional[AppMetaData] = session.query(AppMetaData).first()
@@ -322,7 +379,8 @@ class Spider:
 
                 appstate = AppMetaData(id=1, iteration=0, version=1)
                 session.add(appstate)
-            return appstate.iteration
+            self._iteration_ = appstate.iteration
+            return self._iteration_
 
     def close_database(self, *args) -> None:
         """Closes the database."""
@@ -338,7 +396,10 @@ class Spider:
         if not self._cache_:
             raise ValueError("Cache is not present.")
 
-        log.debug(f"Copying seeds to database: {', '.join(self.configuration.seeds)}.")
+        log.opt(lazy=True).debug(
+            "Copying seeds to database: {}.",
+            lambda: ", ".join(self.configuration.seeds),
+        )
 
         with self._cache_.begin() as session:
             for layer, seeds in self.configuration.seeds.items():
@@ -353,18 +414,19 @@ class Spider:
             raise ValueError("Cache is not present.")
         iteration = self.iteration
         with self._cache_.begin() as session:
-            count = (
-                session.query(SeedList)
-                .filter(
-                    SeedList.iteration == iteration + 1,
-                    SeedList.status == "new",
+            # Only existence matters, which the (iteration, status) index answers
+            has_new_seeds = session.execute(
+                sql.select(
+                    sql.exists().where(
+                        SeedList.iteration == iteration + 1,
+                        SeedList.status == "new",
+                    )
                 )
-                .count()
-            )
+            ).scalar()
 
-        log.debug(f"{count} seeds in the data set, should stop or retry sampling.")
+        log.debug("New seeds in the data set: {}.", has_new_seeds)
 
-        return count > 0
+        return has_new_seeds
 
     def should_retry(self):
         """Checks if the sampling phase should be retried."""
@@ -382,32 +444,28 @@ class Spider:
 
         iteration = self.iteration
 
-        with self._cache_.begin() as session:
-            candidate_nodes_names = (
-                session.execute(sql.select(SeedList.id)).scalars().all()
+        # Nodes which have never been seeds, picked in the database as a single
+        # INSERT ... SELECT instead of shipping all seed ids back and forth.
+        unused_nodes = (
+            sql.select(
+                LayerDenseNodes.name,
+                sql.literal("new"),
+                sql.literal(iteration + 1),
+                sql.func.min(LayerDenseNodes.layer_id),  # pylint: disable=E1102
             )
+            .where(~sql.exists().where(SeedList.id == LayerDenseNodes.name))
+            .group_by(LayerDenseNodes.name)
+        )
 
-            candidates = (
-                session.execute(
-                    sql.select(LayerDenseNodes.name).where(
-                        LayerDenseNodes.name.not_in(candidate_nodes_names)
-                    )
+        with self._cache_.begin() as session:
+            result = session.execute(
+                sql.insert(SeedList).from_select(
+                    ["id", "status", "iteration", "layer"], unused_nodes
                 )
-                .scalars()
-                .all()
             )
 
-            self.retry_count += 1
-            session.add_all(
-                [
-                    SeedList(id=seed, iteration=iteration + 1, status="new")
-                    for seed in candidates
-                ]
-            )
-
-        log.debug(
-            f"{self.retry_count} retry with unused seeds: {', '.join(candidates)}"
-        )
+        self.retry_count += 1
+        log.debug("{} retry with {} unused seeds.", self.retry_count, result.rowcount)
 
     def increment_iteration(self):
         """Increments the iteration counter."""
@@ -417,9 +475,11 @@ class Spider:
         with self._cache_.begin() as session:
             appstate = session.query(AppMetaData).first()
             appstate.iteration += 1
+            self._iteration_ = appstate.iteration
 
     def gather_node_data(self):
-        """Gathers node data for the first task in queue."""
+        """Gathers node data for the next batch of tasks in queue."""
+        # pylint: disable=R0914
         if not self._cache_:
             raise ValueError("Cache is not present.")
         # If there are no tasks left, return early to advance to aggregation state
@@ -427,44 +487,81 @@ class Spider:
         iteration = self.iteration
 
         with self._cache_.begin() as session:
-            tasks = get_open_tasks(session)
+            tasks = get_open_tasks(session, limit=GATHER_BATCH_SIZE)
             if len(tasks) == 0:
                 return
 
-            task = tasks.pop(0)
-
-            log.debug(f"Attempting to gather data for {task.node_id}.")
+            log.debug("Attempting to gather data for {} tasks.", len(tasks))
 
-            # Begin transaction with the cache
+            requested: Dict[str, List[str]] = {}
+            for task in tasks:
+                requested.setdefault(task.connector, []).append(task.node_id)
 
-            node_info = session.get(LayerDenseNodes, task.node_id)
+            # Nodes which already have data in their layer need not be requested again.
+            # The names are bound in chunks, GATHER_BATCH_SIZE may exceed the database's
+            # limit of bound parameters.
+            pending: Dict[str, List[str]] = {}
+            for layer, node_ids in requested.items():
+                known = _select_in_(
+                    session,
+                    LayerDenseNodes.name,
+                    node_ids,
+                    LayerDenseNodes.layer_id == layer,
+                )
+                node_ids = [node_id for node_id in node_ids if node_id not in known]
+                if node_ids:
+                    pending[layer] = node_ids
+
+            # Each layer's connector is called once with all of its nodes. Requests
+            # are I/O-bound, hence the layers' connectors are called concurrently.
+            # Their results are written sequentially, sessions are not thread-safe.
+            # A single layer, the common case, gains nothing from a thread pool.
+            if len(pending) > 1:
+                with ThreadPoolExecutor(max_workers=len(pending)) as executor:
+                    results = list(
+                        executor.map(
+                            self._dispatch_connector_, pending.keys(), pending.values()
+                        )
+                    )
+            else:
+                results = [
+                    self._dispatch_connector_(layer, node_ids)
+                    for layer, node_ids in pending.items()
+                ]
 
-            if node_info is None:
-                raw_edges, nodes = self._dispatch_connector_for_node_(task)
+            for connector_id, (raw_edges, nodes) in zip(pending, results):
                 insert_raw_data(
                     session,
-                    connector_id=task.connector,
+                    connector_id=connector_id,
                     output_type="edges",
                     data=raw_edges.to_dict(orient="records"),
                     iteration=iteration,
                 )
                 insert_raw_data(
                     session,
-                    connector_id=task.connector,
+                    connector_id=connector_id,
                     output_type="nodes",
                     data=nodes.to_dict(orient="records"),
                     iteration=iteration,
                 )
 
-            # Mark the node as done
-            seed = session.get(SeedList, task.node_id)
-
-            if seed is not None:
-                seed.status = "done"
-                seed.last_crawled_at = datetime.now()
-            task.status = "done"
-            task.finished_at = datetime.now()
-            session.commit()
+            # Mark the nodes as done, all of them with the same timestamp. The batch
+            # holds the oldest open tasks, selecting them by id binds a single value.
+            finished_at = datetime.now()
+            session.execute(
+                sql.update(SeedList)
+                .where(
+                    SeedList.id.in_(
+                        sql.select(TaskList.node_id).where(
+                            TaskList.status == "new", TaskList.id <= tasks[-1].id
+                        )
+                    )
+                )
+                .values(status="done", last_crawled_at=finished_at)
+            )
+            for task in tasks:
+                task.status = "done"
+                task.finished_at = finished_at
 
     def route_raw_data(self):
         """Routes raw data to the appropriate layer."""
@@ -476,51 +573,55 @@ class Spider:
         iteration = self.iteration
 
         for layer, layer_configuration in self.configuration.layers.items():
-            routers = layer_configuration.routers
-            for router_definition in routers:
-                for router_name, router_spec in router_definition.items():
-
-                    log.debug(
-                        f"Routing data with {router_name} and this spec: {router_spec}."
+            with self._cache_.begin() as session:
+                connection = session.connection()
+                # Read the layer's raw data once and share it between all routers
+                raw_edges = (
+                    pd.json_normalize(
+                        pd.read_sql(
+                            sql.select(RawDataStore.data).where(
+                                (RawDataStore.connector_id == layer)
+                                & (RawDataStore.output_type == "edges")
+                                & (RawDataStore.iteration == iteration)
+                            ),
+                            connection,
+                        ).data
                     )
-                    router = Router(router_name, router_spec)
-                    with self._cache_.begin() as session:
-                        raw_edges = pd.json_normalize(
-                            pd.read_sql(
-                                sql.select(RawDataStore.data).where(
-                                    (RawDataStore.connector_id == layer)
-                                    & (RawDataStore.output_type == "edges")
-                                    & (RawDataStore.iteration == iteration)
-                                ),
-                                session.connection(),
-                            ).data
-                        )
-                        nodes = pd.json_normalize(
-                            pd.read_sql(
-                                sql.select(RawDataStore.data).where(
-                                    (RawDataStore.connector_id == layer)
-                                    & (RawDataStore.output_type == "nodes")
-                                    & (RawDataStore.iteration == iteration)
-                                ),
-                                session.connection(),
-                            ).data
+                    .assign(iteration=iteration)
+                    .to_dict(orient="records")
+                )
+                nodes = pd.json_normalize(
+                    pd.read_sql(
+                        sql.select(RawDataStore.data).where(
+                            (RawDataStore.connector_id == layer)
+                            & (RawDataStore.output_type == "nodes")
+                            & (RawDataStore.iteration == iteration)
+                        ),
+                        connection,
+                    ).data
+                )
+
+                for router_definition in layer_configuration.routers:
+                    for router_name, router_spec in router_definition.items():
+
+                        log.debug(
+                            "Routing data with {} and this spec: {}.",
+                            router_name,
+                            router_spec,
                         )
+                        router = self._get_router_(layer, router_name, router_spec)
                         edges = []
-                        for raw_edge in raw_edges.assign(iteration=iteration).to_dict(
-                            orient="records"
-                        ):
+                        for raw_edge in raw_edges:
                             edges.extend(router.parse(raw_edge))
                         insert_layer_dense_edge(session, router_name, edges)
 
-                        if len(nodes) > 0:
-                            nodes["iteration"] = iteration
-
-                            insert_layer_dense_node(
-                                session,
-                                layer,
-                                "default",
-                                nodes.to_dict(orient="records"),
-                            )
+                if len(nodes) > 0:
+                    insert_layer_dense_node(
+                        session,
+                        layer,
+                        "default",
+                        nodes.assign(iteration=iteration).to_dict(orient="records"),
+                    )
 
     def iteration_limit_not_reached(self):
         """Checks if the iteration limit has been reached."""
@@ -542,57 +643,73 @@ class Spider:
         iteration = self.iteration
 
         with self._cache_.begin() as session:
+            connection = session.connection()
             for layer_id, layer_config in self.configuration.layers.items():
                 # Get data for the layer from the dense data stores
-                edges = pd.read_sql(
+                result = connection.execute(
                     sql.select(
                         LayerDenseEdges.source,
                         LayerDenseEdges.target,
-                        sql.func.count("*").label("weight"),  # pylint: disable=E1102
+                        sql.func.count().label("weight"),  # pylint: disable=E1102
                     )
                     .where(LayerDenseEdges.layer_id == layer_id)
-                    .group_by(LayerDenseEdges.source, LayerDenseEdges.target),
-                    session.connection(),
+                    .group_by(LayerDenseEdges.source, LayerDenseEdges.target)
+                )
+                edges = pd.DataFrame.from_records(
+                    result.all(), columns=list(result.keys())
                 )
+                # JSON documents are flattened straight from the rows, without an
+                # intermediate one-column DataFrame
                 nodes = pd.json_normalize(
-                    pd.read_sql(
-                        sql.select(LayerDenseNodes.name, LayerDenseNodes.data).where(
+                    connection.execute(
+                        sql.select(LayerDenseNodes.data).where(
                             LayerDenseNodes.layer_id == layer_id
-                        ),
-                        session.connection(),
-                    ).data
+                        )
+                    )
+                    .scalars()
+                    .all()
                 )
                 sampler_state = pd.json_normalize(
-                    pd.read_sql(
+                    connection.execute(
                         sql.select(SamplerStateStore.data).where(
                             SamplerStateStore.layer_id == layer_id
-                        ),
-                        session.connection(),
-                    ).data
+                        )
+                    )
+                    .scalars()
+                    .all()
                 )
 
                 log.debug(
-                    f"""
-                    Sampling layer {layer_id} with {len(edges)} edges and {len(nodes)} nodes.
+                    """
+                    Sampling layer {} with {} edges and {} nodes.
                     Edges to sample:
-    {edges}
+    {}
 
                     Nodes to sample:
-    {nodes}
+    {}
 
                     Sampler state:
-    {sampler_state}
-    """
+    {}
+    """,
+                    layer_id,
+                    len(edges),
+                    len(nodes),
+                    edges,
+                    nodes,
+                    sampler_state,
                 )
 
-                sampler: Strategy = get_plugin(layer_config.sampler, STRATEGY_GROUP)
+                sampler: Strategy = self._get_plugin_(
+                    layer_id, layer_config.sampler, STRATEGY_GROUP
+                )
                 new_seeds, sparse_edges, sparse_nodes, new_sampler_state = sampler(
                     edges, nodes, sampler_state
                 )
 
-                log.info(f"That's the current state of affairs:\n\n{new_sampler_state}")
+                log.info(
+                    "That's the current state of affairs:\n\n{}", new_sampler_state
+                )
 
-                sparse_edges["iteration"] = iteration
                 if len(new_seeds) == 0:
                     log.warning("Found no new seeds.")
                 elif self.retry_count > 0:
@@ -604,31 +721,53 @@ class Spider:
                     session,
                     layer_id,
                     "test",
-                    sparse_edges.query("source.notna() & target.notna()").to_dict(
-                        orient="records"
-                    ),
+                    # Drop incomplete edges before the iteration column is added,
+                    # so that only the rows which are written get copied
+                    sparse_edges.loc[
+                        sparse_edges["source"].notna() & sparse_edges["target"].notna()
+                    ]
+                    .assign(iteration=iteration)
+                    .to_dict(orient="records"),
                 )
                 insert_layer_sparse_node(
                     session, layer_id, "test", sparse_nodes.to_dict(orient="records")
                 )
 
-                for state in new_sampler_state.to_dict(orient="records"):
-                    insert_sampler_state(session, layer_id, iteration, state)
+                insert_sampler_state(
+                    session,
+                    layer_id,
+                    iteration,
+                    new_sampler_state.to_dict(orient="records"),
+                )
 
     # section: private methods
 
-    def _dispatch_connector_for_node_(
-        self, node: TaskList
+    def _get_router_(self, layer: str, name: str, spec: Dict) -> Router:
+        """Returns the router for a layer, it is validated and compiled only once."""
+        key = (layer, name)
+        if key not in self._routers_:
+            self._routers_[key] = Router(name, spec)
+        return self._routers_[key]
+
+    def _get_plugin_(self, layer: str, spec: PlugInSpec, group: str) -> Callable:
+        """Returns a layer's connector or strategy, it is resolved only once."""
+        key = (layer, group)
+        if key not in self._plugins_:
+            self._plugins_[key] = get_plugin(spec, group)
+        return self._plugins_[key]
+
+    def _dispatch_connector_(
+        self, layer: str, node_ids: List[str]
     ) -> Tuple[pd.DataFrame, pd.DataFrame]:
-        # pylint: disable=R0914
+        """Requests the data for a batch of nodes from the layer's connector."""
         if not self.configuration:
             raise ValueError("Configuration or Connector are not present")
         # Get the connector for the layer
-        layer = node.connector
-        layer_configuration = self.configuration.layers[layer]
-        connector_spec = layer_configuration.connector
-        connector = get_plugin(connector_spec, CONNECTOR_GROUP)
+        connector_spec = self.configuration.layers[layer].connector
+        connector = self._get_plugin_(layer, connector_spec, CONNECTOR_GROUP)
 
-        log.debug(f"Requesting data for {node.node_id} from {connector_spec}.")
+        log.debug(
+            "Requesting data for {} nodes from {}.", len(node_ids), connector_spec
+        )
 
-        return connector([node.node_id])
+        return connector(node_ids)
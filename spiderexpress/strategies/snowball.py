@@ -20,7 +20,7 @@ def snowball_strategy(
     edges_outward = edges.loc[~mask, :]
 
     # select 10 edges to follow
-    edges_sampled = edges_outward.copy()
+    edges_sampled = edges_outward
 
     new_seeds = (
         edges_sampled.target.unique()
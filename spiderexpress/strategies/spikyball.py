@@ -175,7 +175,7 @@ def calc_prob(table: pd.DataFrame, params: ProbabilityConfiguration) -> pd.Serie
                     f"Column {weight.name} contains NaN values which will be replaced with '1'."
                 )
                 weight.fillna(1, inplace=True)
-        log.debug(f"Using this weight matrix: {weights}")
+        log.debug("Using this weight matrix: {}", weights)
         return reduce(lambda x, y: x * y, weights) ** params.coefficient
     return pd.Series([1 for _ in range(len(table))], dtype=float)
 
@@ -242,21 +242,22 @@ def sample_edges(
 
     s_k = calc_norm(source_prob, edge_prob, target_prob)
 
-    log.debug(
-        f"""{pd.concat([
-        source_prob.copy().rename("f"),
-        edge_prob.copy().rename("g"),
-        target_prob.copy().rename("h")
-    ], axis=1)}
-s_k:{s_k}
-"""
+    log.opt(lazy=True).debug(
+        "{}\ns_k:{}\n",
+        lambda: pd.concat(
+            [source_prob.rename("f"), edge_prob.rename("g"), target_prob.rename("h")],
+            axis=1,
+        ),
+        lambda: s_k,
     )
 
-    outward_edges.loc[:, "probability"] = (source_prob * edge_prob * target_prob) / s_k
+    outward_edges = outward_edges.assign(
+        probability=(source_prob * edge_prob * target_prob) / s_k
+    )
 
     outward_edges = outward_edges.loc[outward_edges.probability > 0, :]
 
-    log.debug(f"Sampling these data points:\n{outward_edges}\n")
+    log.debug("Sampling these data points:\n{}\n", outward_edges)
 
     if (
         len(outward_edges.target.unique()) <= max_layer_size
@@ -275,7 +276,7 @@ s_k:{s_k}
 
 
 def filter_edges(
-    edges: pd.DataFrame, known_nodes: List[str]
+    edges: pd.DataFrame, known_nodes: Union[List[str], pd.Series]
 ) -> Tuple[pd.DataFrame, pd.DataFrame]:
     """
     When the raw data has been collected from the network,
@@ -290,7 +291,7 @@ def filter_edges(
     edges : pd.DataFrame
         the edges to filter
 
-    known_nodes : List[str]
+    known_nodes : Union[List[str], pd.Series]
         the nodes to split the edge table on
 
     Returns
@@ -299,15 +300,8 @@ def filter_edges(
     Tuple[pd.DataFrame, pd.DataFrame] : edges to known nodes and edges to unknown nodes
     """
     mask = edges.target.isin(known_nodes)
-    groups = {
-        "in": edges.loc[mask, :],
-        "out": edges.loc[~mask, :],
-    }
 
-    return (
-        groups["in"] if "in" in groups else pd.DataFrame(),
-        groups["out"] if "out" in groups else pd.DataFrame(),
-    )
+    return edges.loc[mask, :], edges.loc[~mask, :]
 
 
 def spikyball_strategy(
@@ -341,7 +335,8 @@ def spikyball_strategy(
     if first_round:
         state = pd.DataFrame({"node_id": edges.source.unique()})
 
-    e_in, e_out = filter_edges(edges, state.node_id.tolist())
+    # Hand over the column itself, isin hashes it without boxing a list first
+    e_in, e_out = filter_edges(edges, state.node_id)
     seeds, sparse_edges = sample_edges(
         e_out,
         nodes,
@@ -11,6 +11,7 @@ from pathlib import Path
 from typing import Callable, Dict, List, Literal, Optional, Tuple, Type, TypeVar, Union
 
 import pandas as pd
+import yaml
 from pydantic.dataclasses import dataclass
 
 Connector = Callable[[List[str]], Tuple[pd.DataFrame, pd.DataFrame]]
@@ -50,8 +51,14 @@ ColumnSpec = Dict[str, Union[str, Dict[str, str]]]
 
 StopCondition = Literal["stop", "retry"]
 
+YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)  # pylint: disable=C0103
+"""Loader for configuration files, libyaml's C implementation if it is available."""
 
-@dataclass()
+YAML_DUMPER = getattr(yaml, "CSafeDumper", yaml.SafeDumper)  # pylint: disable=C0103
+"""Dumper for configuration files, libyaml's C implementation if it is available."""
+
+
+@dataclass(slots=True)
 class Configuration:
     """Configuration-File Wrapper.
 
@@ -1,4 +1,5 @@
 """Test suite for spiderexpress.connectors.csv_connector."""
+import pandas as pd
 import pytest
 
 from spiderexpress.connectors import csv_connector
@@ -52,9 +53,52 @@ def test_retrieval_modes(mode, shape, seventh_grader_configuration):
     assert nodes.empty is False
     assert len(nodes.index) == 2
 
+
+def test_duplicate_node_ids(seventh_grader_configuration):
+    """Should return the same edges and nodes if a node is requested twice."""
+    edges, nodes = csv_connector(["1", "13"], seventh_grader_configuration)
+    edges_dup, nodes_dup = csv_connector(["1", "13", "1"], seventh_grader_configuration)
+
+    assert edges_dup.equals(edges)
+    assert nodes_dup.equals(nodes)
+
+
 def test_caching(seventh_grader_configuration):
     """Should correctly cache the edges and nodes."""
     seventh_grader_configuration["cache"] = True
     _, _ = csv_connector(["1", "13"], seventh_grader_configuration)
 
     assert seventh_grader_configuration["edge_list_location"] in _cache
+
+
+def test_ids_are_read_verbatim(tmp_path):
+    """Should keep ids as written, e.g. with leading zeros or next to empty cells."""
+    edge_list = tmp_path / "edges.csv"
+    edge_list.write_text("source,target,weight\n007,1,\n007,,2\n", encoding="utf8")
+
+    edges, _ = csv_connector(
+        ["007"], {"edge_list_location": str(edge_list), "mode": "out", "cache": False}
+    )
+
+    assert edges.source.tolist() == ["007", "007"]
+    assert edges.target.tolist()[0] == "1"
+
+
+def test_only_cached_frames_are_categorical(seventh_grader_configuration):
+    """Should convert the id columns to categoricals for cached frames only."""
+    seventh_grader_configuration["mode"] = "both"
+    seventh_grader_configuration["cache"] = False
+    edges, nodes = csv_connector(["1", "13"], seventh_grader_configuration)
+
+    assert not isinstance(edges.source.dtype, pd.CategoricalDtype)
+    assert not isinstance(nodes.name.dtype, pd.CategoricalDtype)
+
+    seventh_grader_configuration["cache"] = True
+    cached_edges, cached_nodes = csv_connector(
+        ["1", "13"], seventh_grader_configuration
+    )
+
+    assert isinstance(cached_edges.source.dtype, pd.CategoricalDtype)
+    assert isinstance(cached_nodes.name.dtype, pd.CategoricalDtype)
+    assert cached_edges.astype(str).equals(edges.astype(str))
+    assert cached_nodes.astype(str).equals(nodes.astype(str))
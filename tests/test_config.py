@@ -1,12 +1,13 @@
 """test suite for spiderexpress.Configuration"""
 
+from dataclasses import asdict
 from typing import Dict
 
 import pytest
 import yaml
 
 from spiderexpress import Configuration
-from spiderexpress.types import from_dict
+from spiderexpress.types import YAML_DUMPER, YAML_LOADER, from_dict
 
 # pylint: disable=W0621
 
@@ -80,3 +81,10 @@ def test_layers_must_have_a_router_configuration():
         from_dict(
             Configuration, {"layers": {"test": {}}, "seeds": {"test": ["1", "13"]}}
         )
+
+
+def test_configuration_yaml_round_trip():
+    """Should dump a configuration and parse it back with the YAML (de-)serializers."""
+    config = from_dict(Configuration, {"project_name": "test", "seeds": {"a": ["1"]}})
+    dumped = yaml.dump(asdict(config), Dumper=YAML_DUMPER)
+    assert from_dict(Configuration, yaml.load(dumped, Loader=YAML_LOADER)) == config
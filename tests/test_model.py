@@ -6,7 +6,17 @@ import pytest
 import sqlalchemy as sql
 from sqlalchemy.orm import Session
 
-from spiderexpress.model import AppMetaData, Base, SeedList
+from spiderexpress.model import (
+    AppMetaData,
+    Base,
+    LayerDenseNodes,
+    SeedList,
+    TaskList,
+    has_open_tasks,
+    insert_layer_dense_node,
+    insert_seeds,
+    insert_task,
+)
 
 # pylint: disable=W0621
 
@@ -50,6 +60,21 @@ def test_app_state_table(session, create_tables):
     assert session.query(AppMetaData).count() == 1
 
 
+def test_repr(session, create_tables):
+    """Should represent a row by its loaded columns."""
+
+    create_tables()
+
+    appstate = AppMetaData(id="a", version=1)
+    assert repr(appstate) == "<AppMetaData id=a version=1 />"
+
+    appstate.iteration = 0
+    session.add(appstate)
+    session.commit()
+    # Expired attributes are left out instead of being shown as None
+    assert "id=" not in repr(appstate)
+
+
 def test_seed_list_table(session, create_tables):
     """Test the creation of a node table."""
 
@@ -62,3 +87,72 @@ def test_seed_list_table(session, create_tables):
     session.commit()
 
     assert session.query(SeedList).count() == 1
+
+
+def test_insert_seeds_deduplicates(session, create_tables):
+    """Should create a single seed and task for repeated seeds."""
+
+    create_tables()
+
+    insert_seeds(session, ["a", "b", "a"], "test")
+    session.commit()
+
+    assert session.query(SeedList).count() == 2
+    assert session.query(TaskList).count() == 2
+
+
+def test_insert_layer_dense_node_upserts(session, create_tables):
+    """Should keep one row per node, holding the data which was inserted last."""
+
+    create_tables()
+
+    insert_layer_dense_node(
+        session, "test", "default", [{"name": "a", "n": 1}, {"name": "b", "n": 1}]
+    )
+    insert_layer_dense_node(
+        session, "test", "default", [{"name": "a", "n": 2}, {"name": "a", "n": 3}]
+    )
+    session.commit()
+
+    assert session.query(LayerDenseNodes).count() == 2
+    assert session.get(LayerDenseNodes, "test:a").data == {"name": "a", "n": 3}
+
+
+def test_insert_seeds_skips_known_seeds(session, create_tables):
+    """Should not add a second task for a node which already is a seed."""
+
+    create_tables()
+
+    insert_seeds(session, ["a", "b"], "test")
+    insert_seeds(session, ["b", "c", "c"], "test")
+    session.commit()
+
+    assert sorted(task.node_id for task in session.query(TaskList)) == ["a", "b", "c"]
+
+
+def test_has_open_tasks(session, create_tables):
+    """Should report open tasks until all of them are done."""
+
+    create_tables()
+
+    assert not has_open_tasks(session)
+
+    insert_task(session, ["a"], "test", None)
+    assert has_open_tasks(session)
+
+    session.query(TaskList).update({"status": "done"})
+    assert not has_open_tasks(session)
+
+
+def test_insert_seeds_with_many_seeds(session, create_tables):
+    """Should look up more seeds than fit into a single IN clause."""
+
+    create_tables()
+
+    seeds = [str(seed) for seed in range(2000)]
+    insert_seeds(session, seeds[:1000], "test")
+    insert_seeds(session, seeds, "test")
+    session.commit()
+
+    assert session.query(SeedList).count() == 2000
+    assert session.query(TaskList).count() == 2000
@@ -0,0 +1,51 @@
+"""Test suite for spiderexpress' plug-in manager."""
+
+import pytest
+
+from spiderexpress.connectors.csv import csv_connector
+from spiderexpress.plugin_manager import (
+    CONNECTOR_GROUP,
+    STRATEGY_GROUP,
+    get_plugin,
+    get_table_configuration,
+)
+
+
+@pytest.mark.parametrize(
+    "spec",
+    [
+        pytest.param("csv", id="name"),
+        pytest.param({"csv": {"mode": "out"}}, id="name_and_configuration"),
+    ],
+)
+def test_get_plugin(spec):
+    """Should resolve a plug-in from its name or its name and configuration."""
+    plugin = get_plugin(spec, CONNECTOR_GROUP)
+
+    assert plugin.func is csv_connector
+
+
+@pytest.mark.parametrize(
+    "spec",
+    [
+        pytest.param("nope", id="name"),
+        pytest.param({"nope": {}}, id="name_and_configuration"),
+    ],
+)
+def test_get_plugin_not_found(spec):
+    """Should raise if the plug-in is not installed."""
+    with pytest.raises(ValueError):
+        get_plugin(spec, CONNECTOR_GROUP)
+
+
+def test_get_plugin_unknown_spec():
+    """Should raise if the spec is neither a name nor a dictionary."""
+    with pytest.raises(TypeError):
+        get_plugin(["csv"], CONNECTOR_GROUP)
+
+
+def test_get_table_configuration():
+    """Should return the tables a plug-in needs."""
+    assert get_table_configuration("random", STRATEGY_GROUP) == {
+        "state": {"node_id": "Text"}
+    }
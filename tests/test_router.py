@@ -32,6 +32,16 @@ from spiderexpress.router import Router, RouterValidationError
             {"connectors": {"layer_1": {"type": "something", "columns": {"column1"}}}},
             id="field is None",
         ),
+        pytest.param(
+            {
+                "source": "column",
+                "target": [
+                    {"field": "column", "pattern": "(", "dispatch_with": "layer_1"}
+                ],
+            },
+            None,
+            id="pattern_does_not_compile",
+        ),
     ],
 )
 def test_router_spec_validation(
@@ -6,12 +6,49 @@ It is loaded by click as soon as the application starts and the configuration
 is loaded automatically by the initializer.
 """
 
-# pylint: disable=E1101
+# pylint: disable=E1101,W0621
+import threading
 from pathlib import Path
 
+import pandas as pd
+import pytest
 from pytest import skip
 
-from spiderexpress.spider import Spider
+from spiderexpress.model import (
+    SeedList,
+    TaskList,
+    insert_layer_dense_node,
+    insert_seeds,
+)
+from spiderexpress.spider import CONNECTOR_GROUP, Spider
+
+
+@pytest.fixture
+def spider():
+    """Creates a spider with an open in-memory database."""
+    spider = Spider(auto_transitions=False)
+    spider.load_config(Path("tests/stubs/sevens_grader_random_test.pe.yml"))
+    spider.open_database()
+    yield spider
+    spider._engine_.dispose()  # pylint: disable=W0212
+
+
+@pytest.fixture
+def connector_calls(spider):
+    """Replaces the test layer's connector with one recording its calls."""
+    calls = []
+
+    def _connector_(node_ids):
+        calls.append(list(node_ids))
+        return pd.DataFrame(), pd.DataFrame()
+
+    spider._plugins_[("test", CONNECTOR_GROUP)] = _connector_  # pylint: disable=W0212
+    return calls
+
+
+def _task_status_(spider):
+    with spider._cache_.begin() as session:  # pylint: disable=W0212
+        return {task.node_id: task.status for task in session.query(TaskList)}
 
 
 def test_config_discover():
@@ -85,3 +122,155 @@ def test_get_connector():
     Spider should be able to handle requesting networks from different social
     media platforms or web interfaces.
     """
+
+
+def test_load_config_reads_current_seed_file(tmp_path):
+    """Should pick up changes to the seed file for every spider."""
+    seed_file = tmp_path / "seeds.json"
+    config_file = tmp_path / "test.pe.yml"
+    config_file.write_text(f"seed_file: {seed_file}\n", encoding="utf8")
+
+    seed_file.write_text('{"test": ["1"]}', encoding="utf8")
+    first = Spider()
+    first.load_config(config_file)
+
+    seed_file.write_text('{"test": ["2"]}', encoding="utf8")
+    second = Spider()
+    second.load_config(config_file)
+
+    assert first.configuration.seeds == {"test": ["1"]}
+    assert second.configuration.seeds == {"test": ["2"]}
+    assert first.configuration is not second.configuration
+
+
+def test_gather_node_data_skips_known_nodes(spider, connector_calls):
+    """Should not request nodes which already have data in their layer."""
+    with spider._cache_.begin() as session:  # pylint: disable=W0212
+        insert_seeds(session, ["1"], "test")
+        insert_layer_dense_node(session, "test", "default", [{"name": "1"}])
+
+    spider.gather_node_data()
+
+    assert connector_calls == []
+    assert _task_status_(spider) == {"1": "done"}
+
+
+def test_gather_node_data_requests_nodes_known_in_other_layers(spider, connector_calls):
+    """Should request nodes which only have data in another layer."""
+    with spider._cache_.begin() as session:  # pylint: disable=W0212
+        insert_seeds(session, ["1", "2"], "test")
+        insert_layer_dense_node(session, "test", "default", [{"name": "1"}])
+        insert_layer_dense_node(session, "other", "default", [{"name": "2"}])
+
+    spider.gather_node_data()
+
+    assert connector_calls == [["2"]]
+    assert _task_status_(spider) == {"1": "done", "2": "done"}
+
+
+def test_gather_node_data_probes_known_nodes_in_chunks(
+    spider, connector_calls, monkeypatch
+):
+    """Should skip known nodes also when they are looked up in several chunks."""
+    monkeypatch.setattr("spiderexpress.model._IN_CLAUSE_SIZE_", 2)
+    with spider._cache_.begin() as session:  # pylint: disable=W0212
+        insert_seeds(session, ["1", "2", "3", "4", "5"], "test")
+        insert_layer_dense_node(
+            session, "test", "default", [{"name": "1"}, {"name": "4"}]
+        )
+
+    spider.gather_node_data()
+
+    assert connector_calls == [["2", "3", "5"]]
+    with spider._cache_.begin() as session:  # pylint: disable=W0212
+        assert {seed.status for seed in session.query(SeedList)} == {"done"}
+
+
+def test_gather_node_data_batches_tasks(spider, connector_calls, monkeypatch):
+    """Should request one batch of tasks with a single call per layer."""
+    monkeypatch.setattr("spiderexpress.spider.GATHER_BATCH_SIZE", 2)
+    with spider._cache_.begin() as session:  # pylint: disable=W0212
+        insert_seeds(session, ["1", "2", "3"], "test")
+
+    spider.gather_node_data()
+
+    assert connector_calls == [["1", "2"]]
+    assert _task_status_(spider) == {"1": "done", "2": "done", "3": "new"}
+    with spider._cache_.begin() as session:  # pylint: disable=W0212
+        seeds = {seed.id: seed.status for seed in session.query(SeedList)}
+    assert seeds == {"1": "done", "2": "done", "3": "new"}
+
+    spider.gather_node_data()
+
+    assert connector_calls == [["1", "2"], ["3"]]
+    assert spider.is_gathering_done()
+
+
+def test_retry_with_unused_seeds(spider):
+    """Should add every dense node which never was a seed to the next iteration."""
+    with spider._cache_.begin() as session:  # pylint: disable=W0212
+        insert_seeds(session, ["1"], "test")
+        insert_layer_dense_node(
+            session, "test", "default", [{"name": "1"}, {"name": "2"}, {"name": "3"}]
+        )
+        insert_layer_dense_node(session, "other", "default", [{"name": "2"}])
+
+    spider.retry_with_unused_seeds()
+
+    with spider._cache_.begin() as session:  # pylint: disable=W0212
+        seeds = {
+            seed.id: (seed.layer, seed.iteration, seed.status)
+            for seed in session.query(SeedList)
+        }
+    assert seeds == {
+        "1": ("test", 0, "new"),
+        "2": ("other", 1, "new"),
+        "3": ("test", 1, "new"),
+    }
+    assert spider.retry_count == 1
+    assert spider.should_not_stop_sampling()
+
+
+def test_gather_node_data_calls_layers_concurrently(spider):
+    """Should call the connectors of different layers at the same time."""
+    spider.configuration.layers["other"] = spider.configuration.layers["test"]
+    # Each connector waits for the other one, sequential calls would time out
+    barrier = threading.Barrier(2, timeout=5)
+    calls = {}
+
+    def _connector_for_(layer):
+        def _connector_(node_ids):
+            barrier.wait()
+            calls[layer] = list(node_ids)
+            return pd.DataFrame(), pd.DataFrame()
+
+        return _connector_
+
+    plugins = spider._plugins_  # pylint: disable=W0212
+    for layer in ["test", "other"]:
+        plugins[(layer, CONNECTOR_GROUP)] = _connector_for_(layer)
+    with spider._cache_.begin() as session:  # pylint: disable=W0212
+        insert_seeds(session, ["1"], "test")
+        insert_seeds(session, ["2"], "other")
+
+    spider.gather_node_data()
+
+    assert calls == {"test": ["1"], "other": ["2"]}
+    assert _task_status_(spider) == {"1": "done", "2": "done"}
+
+
+def test_gather_node_data_calls_single_layer_directly(spider):
+    """Should call a single layer's connector without a thread pool."""
+    threads = []
+
+    def _connector_(node_ids):  # pylint: disable=W0613
+        threads.append(threading.get_ident())
+        return pd.DataFrame(), pd.DataFrame()
+
+    spider._plugins_[("test", CONNECTOR_GROUP)] = _connector_  # pylint: disable=W0212
+    with spider._cache_.begin() as session:  # pylint: disable=W0212
+        insert_seeds(session, ["1", "2"], "test")
+
+    spider.gather_node_data()
+
+    assert threads == [threading.get_ident()]